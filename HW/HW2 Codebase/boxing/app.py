@@ -20,6 +20,12 @@ app = Flask(__name__)
 ring_model = RingModel()
 configure_logger(app.logger)
 
+# Bring databases built by older versions of init_db.sql up to date
+try:
+    boxers_model.migrate_boxers_table()
+except Exception as e:
+    app.logger.error(f"Failed to migrate the boxers table: {e}")
+
 
 ####################################################
 #
@@ -1,17 +1,103 @@
+from bisect import bisect_right
+from collections import OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 import sqlite3
-from typing import Any, List
+import threading
+import time
+from typing import Any, Iterable, List
 
-from boxing.utils.sql_utils import get_db_connection
+from boxing.utils.sql_utils import ConnectionPool
 from boxing.utils.logger import configure_logger
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
-
-@dataclass
+# Lower bounds of each weight class above featherweight, parallel to _WC_LABELS[1:]
+_WC_MIN_WEIGHT = 125
+_WC_CUTOFFS = (133, 166, 203)
+_WC_LABELS = ('FEATHERWEIGHT', 'LIGHTWEIGHT', 'MIDDLEWEIGHT', 'HEAVYWEIGHT')
+
+# Messages raised from more than one place
+_ERR_WEIGHT = f"Invalid weight: {{}}. Must be at least {_WC_MIN_WEIGHT}."
+_ERR_NAME_EXISTS = "Boxer with name '{}' already exists"
+_ERR_ID_NOT_FOUND = "Boxer with ID {} not found."
+
+_SQL_INSERT_BOXER = """
+    INSERT INTO boxers (name, weight, height, reach, age)
+    VALUES (?, ?, ?, ?, ?)
+"""
+_SQL_DELETE_BOXER = "DELETE FROM boxers WHERE id = ?"
+# Same classes as get_weight_class (built from the same cutoffs), computed by SQLite for
+# rows it returns. Weights below the minimum have no class and come back as NULL, so a
+# Boxer built from such a row falls back to get_weight_class, which raises.
+_SQL_WEIGHT_CLASS = "CASE" + "".join(
+    f" WHEN weight >= {cutoff} THEN '{label}'"
+    for cutoff, label in reversed(list(zip((_WC_MIN_WEIGHT,) + _WC_CUTOFFS, _WC_LABELS)))
+) + " END AS weight_class"
+# Win percentage is computed by SQLite too, so rows map straight to dicts
+_SQL_LEADERBOARD = """
+    SELECT id, name, weight, height, reach, age, """ + _SQL_WEIGHT_CLASS + """,
+           fights, wins,
+           ROUND(wins * 100.0 / fights, 1) AS win_pct
+    FROM boxers
+    WHERE fights > 0
+"""
+_SQL_LEADERBOARD_BY_WINS = _SQL_LEADERBOARD + " ORDER BY wins DESC"
+# Sort on the unrounded (indexed) ratio so ties on the displayed percentage keep their order
+_SQL_LEADERBOARD_BY_WIN_PCT = _SQL_LEADERBOARD + " ORDER BY win_ratio DESC"
+_SQL_GET_BY_ID = """
+    SELECT id, name, weight, height, reach, age, """ + _SQL_WEIGHT_CLASS + """
+    FROM boxers WHERE id = ?
+"""
+_SQL_GET_BY_NAME = """
+    SELECT id, name, weight, height, reach, age, """ + _SQL_WEIGHT_CLASS + """
+    FROM boxers WHERE name = ?
+"""
+# Formatted with one "?" per id; ids are sent in chunks to stay under SQLite's
+# bound-parameter limit (999 on older builds)
+_SQL_GET_BY_IDS = """
+    SELECT id, name, weight, height, reach, age, """ + _SQL_WEIGHT_CLASS + """
+    FROM boxers WHERE id IN ({})
+"""
+_MAX_IDS_PER_QUERY = 500
+_SQL_RECORD_WIN = "UPDATE boxers SET fights = fights + 1, wins = wins + 1 WHERE id = ?"
+_SQL_RECORD_LOSS = "UPDATE boxers SET fights = fights + 1 WHERE id = ?"
+# Statement recording each fight result; also defines which results are valid
+_RESULT_SQL = {'win': _SQL_RECORD_WIN, 'loss': _SQL_RECORD_LOSS}
+
+# Schema added to init_db.sql after databases were already deployed; applied by
+# migrate_boxers_table so a database built by the older script keeps working
+_SQL_ADD_WIN_RATIO = (
+    "ALTER TABLE boxers ADD COLUMN win_ratio REAL GENERATED ALWAYS AS"
+    " (CASE WHEN fights > 0 THEN wins * 1.0 / fights ELSE 0 END) VIRTUAL"
+)
+_SQL_CREATE_LEADERBOARD_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_boxers_lb_wins ON boxers(wins DESC) WHERE fights > 0",
+    "CREATE INDEX IF NOT EXISTS idx_boxers_lb_win_ratio ON boxers(win_ratio DESC) WHERE fights > 0",
+)
+
+# Shared across requests so connections (and their page caches) outlive a single call.
+# The point lookups and writes are prepared once per connection up front with
+# placeholder params; the leaderboard queries are prepared on first use.
+_pool = ConnectionPool(
+    read_statements=(
+        (_SQL_GET_BY_ID, (0,)),
+        (_SQL_GET_BY_NAME, ("",)),
+    ),
+    write_statements=(
+        (_SQL_INSERT_BOXER, ("", _WC_MIN_WEIGHT, 1, 1, 18)),
+        (_SQL_DELETE_BOXER, (0,)),
+        (_SQL_RECORD_WIN, (0,)),
+        (_SQL_RECORD_LOSS, (0,)),
+    ),
+)
+
+
+# Frozen because lookups hand out shared cached instances
+@dataclass(slots=True, frozen=True)
 class Boxer:
     id: int
     name: str
@@ -22,13 +108,90 @@ class Boxer:
     weight_class: str = None
 
     def __post_init__(self):
-        self.weight_class = get_weight_class(self.weight)  # Automatically assign weight class
-
-
-def create_boxer(name: str, weight: int, height: int, reach: float, age: int) -> None:
-
-    if weight < 125:
-        raise ValueError(f"Invalid weight: {weight}. Must be at least 125.")
+        if self.weight_class is None:
+            # Automatically assign weight class (object.__setattr__ bypasses the frozen check)
+            object.__setattr__(self, 'weight_class', get_weight_class(self.weight))
+
+
+# LRU caches of looked-up boxers, keyed by id and by name. Both are filled together
+# and entries are dropped when the boxer is deleted. Lookups that started before an
+# invalidation are not cached (tracked by _boxer_cache_version) so stale rows can't
+# be re-inserted.
+_BOXER_CACHE_SIZE = 4096
+_boxer_by_id: OrderedDict[int, Boxer] = OrderedDict()
+_boxer_by_name: OrderedDict[str, Boxer] = OrderedDict()
+_boxer_cache_lock = threading.Lock()
+_boxer_cache_version = 0
+
+
+# Leaderboard results per sort_by, as (time.monotonic() timestamp, rows).
+# Cleared by every write; the TTL bounds staleness from a read racing a write.
+_LEADERBOARD_TTL = 1.0
+# Rows are kept as immutable sqlite3.Row tuples; each caller gets freshly built dicts.
+_LEADERBOARD_CACHE: dict[str, tuple[float, tuple]] = {}
+
+
+def _boxer_from_row(row: sqlite3.Row) -> Boxer:
+    return Boxer(
+        id=row[0], name=row[1], weight=row[2], height=row[3],
+        reach=row[4], age=row[5], weight_class=row[6]
+    )
+
+
+def _get_cached_boxer(cache: OrderedDict, key) -> Boxer:
+    with _boxer_cache_lock:
+        boxer = cache.get(key)
+        if boxer is not None:
+            cache.move_to_end(key)
+        return boxer
+
+
+def _cache_boxer(boxer: Boxer, version: int) -> None:
+    with _boxer_cache_lock:
+        if version != _boxer_cache_version:
+            return
+        for cache, key in ((_boxer_by_id, boxer.id), (_boxer_by_name, boxer.name)):
+            cache[key] = boxer
+            cache.move_to_end(key)
+            if len(cache) > _BOXER_CACHE_SIZE:
+                cache.popitem(last=False)
+
+
+def _invalidate_boxer(boxer_id: int) -> None:
+    global _boxer_cache_version
+    with _boxer_cache_lock:
+        _boxer_cache_version += 1
+        boxer = _boxer_by_id.pop(boxer_id, None)
+        if boxer is not None:
+            if boxer.name in _boxer_by_name and _boxer_by_name[boxer.name].id == boxer_id:
+                del _boxer_by_name[boxer.name]
+            return
+        # The two caches evict independently, so the name entry may outlive the id entry;
+        # only then fall back to scanning for it
+        for name in [name for name, boxer in _boxer_by_name.items() if boxer.id == boxer_id]:
+            del _boxer_by_name[name]
+
+
+def migrate_boxers_table() -> None:
+    # Idempotent; safe to run on every startup
+    with _pool.transaction() as conn:
+        # table_xinfo (unlike table_info) also lists generated columns
+        columns = {row["name"] for row in conn.execute("PRAGMA table_xinfo(boxers)")}
+        if not columns:
+            logger.warning("Boxers table does not exist yet; skipping migration")
+            return
+
+        if "win_ratio" not in columns:
+            logger.info("Adding win_ratio column to the boxers table")
+            conn.execute(_SQL_ADD_WIN_RATIO)
+
+        for sql in _SQL_CREATE_LEADERBOARD_INDEXES:
+            conn.execute(sql)
+
+
+def _validate_boxer(weight: int, height: int, reach: float, age: int) -> None:
+    if weight < _WC_MIN_WEIGHT:
+        raise ValueError(_ERR_WEIGHT.format(weight))
     if height <= 0:
         raise ValueError(f"Invalid height: {height}. Must be greater than 0.")
     if reach <= 0:
@@ -36,169 +199,189 @@ def create_boxer(name: str, weight: int, height: int, reach: float, age: int) ->
     if not (18 <= age <= 40):
         raise ValueError(f"Invalid age: {age}. Must be between 18 and 40.")
 
+
+def create_boxer(name: str, weight: int, height: int, reach: float, age: int) -> None:
+
+    _validate_boxer(weight, height, reach, age)
+
     try:
-        with get_db_connection() as conn:
+        with _pool.transaction() as conn:
             cursor = conn.cursor()
 
-            # Check if the boxer already exists (name must be unique)
-            cursor.execute("SELECT 1 FROM boxers WHERE name = ?", (name,))
-            if cursor.fetchone():
-                raise ValueError(f"Boxer with name '{name}' already exists")
-
-            cursor.execute("""
-                INSERT INTO boxers (name, weight, height, reach, age)
-                VALUES (?, ?, ?, ?, ?)
-            """, (name, weight, height, reach, age))
+            # The UNIQUE constraint on name rejects duplicates (handled below)
+            cursor.execute(_SQL_INSERT_BOXER, (name, weight, height, reach, age))
 
-            conn.commit()
+        _LEADERBOARD_CACHE.clear()
 
     except sqlite3.IntegrityError:
-        raise ValueError(f"Boxer with name '{name}' already exists")
+        raise ValueError(_ERR_NAME_EXISTS.format(name))
 
-    except sqlite3.Error as e:
-        raise e
 
+def create_boxers(rows: List[tuple[str, int, int, float, int]]) -> None:
+    # Bulk create_boxer for seeding/imports: rows of (name, weight, height, reach, age)
+    # are all validated first, then inserted in one transaction (all or nothing)
+    rows = [tuple(row) for row in rows]
+    for name, weight, height, reach, age in rows:
+        _validate_boxer(weight, height, reach, age)
 
-def delete_boxer(boxer_id: int) -> None:
     try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
+        with _pool.transaction() as conn:
+            conn.executemany(_SQL_INSERT_BOXER, rows)
 
-            cursor.execute("SELECT id FROM boxers WHERE id = ?", (boxer_id,))
-            if cursor.fetchone() is None:
-                raise ValueError(f"Boxer with ID {boxer_id} not found.")
+        _LEADERBOARD_CACHE.clear()
 
-            cursor.execute("DELETE FROM boxers WHERE id = ?", (boxer_id,))
-            conn.commit()
+    except sqlite3.IntegrityError:
+        # Rare path: find the name that clashed, within the batch or with an existing boxer
+        seen = set()
+        with _pool.acquire() as conn:
+            for name, *_ in rows:
+                if name in seen or conn.execute(_SQL_GET_BY_NAME, (name,)).fetchone():
+                    raise ValueError(_ERR_NAME_EXISTS.format(name))
+                seen.add(name)
+        raise
 
-    except sqlite3.Error as e:
-        raise e
 
+def delete_boxer(boxer_id: int) -> None:
+    with _pool.transaction() as conn:
+        cursor = conn.cursor()
 
-def get_leaderboard(sort_by: str = "wins") -> List[dict[str, Any]]:
-    query = """
-        SELECT id, name, weight, height, reach, age, fights, wins,
-               (wins * 1.0 / fights) AS win_pct
-        FROM boxers
-        WHERE fights > 0
-    """
+        cursor.execute(_SQL_DELETE_BOXER, (boxer_id,))
+        if cursor.rowcount == 0:
+            raise ValueError(_ERR_ID_NOT_FOUND.format(boxer_id))
 
+    _invalidate_boxer(boxer_id)
+    _LEADERBOARD_CACHE.clear()
+
+
+def get_leaderboard(sort_by: str = "wins") -> List[dict[str, Any]]:
     if sort_by == "win_pct":
-        query += " ORDER BY win_pct DESC"
+        query = _SQL_LEADERBOARD_BY_WIN_PCT
     elif sort_by == "wins":
-        query += " ORDER BY wins DESC"
+        query = _SQL_LEADERBOARD_BY_WINS
     else:
         raise ValueError(f"Invalid sort_by parameter: {sort_by}")
 
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query)
-            rows = cursor.fetchall()
-
-        leaderboard = []
-        for row in rows:
-            boxer = {
-                'id': row[0],
-                'name': row[1],
-                'weight': row[2],
-                'height': row[3],
-                'reach': row[4],
-                'age': row[5],
-                'weight_class': get_weight_class(row[2]),  # Calculate weight class
-                'fights': row[6],
-                'wins': row[7],
-                'win_pct': round(row[8] * 100, 1)  # Convert to percentage
-            }
-            leaderboard.append(boxer)
-
-        return leaderboard
-
-    except sqlite3.Error as e:
-        raise e
+    cached = _LEADERBOARD_CACHE.get(sort_by)
+    if cached is not None and time.monotonic() - cached[0] < _LEADERBOARD_TTL:
+        return [dict(row) for row in cached[1]]
 
+    with _pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query)
+        rows = tuple(cursor.fetchall())
 
-def get_boxer_by_id(boxer_id: int) -> Boxer:
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, weight, height, reach, age
-                FROM boxers WHERE id = ?
-            """, (boxer_id,))
-
-            row = cursor.fetchone()
-
-            if row:
-                boxer = Boxer(
-                    id=row[0], name=row[1], weight=row[2], height=row[3],
-                    reach=row[4], age=row[5]
-                )
-                return boxer
-            else:
-                raise ValueError(f"Boxer with ID {boxer_id} not found.")
+    _LEADERBOARD_CACHE[sort_by] = (time.monotonic(), rows)
+    return [dict(row) for row in rows]
 
-    except sqlite3.Error as e:
-        raise e
 
+def get_boxer_by_id(boxer_id: int) -> Boxer:
+    boxer = _get_cached_boxer(_boxer_by_id, boxer_id)
+    if boxer is not None:
+        return boxer
 
-def get_boxer_by_name(boxer_name: str) -> Boxer:
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT id, name, weight, height, reach, age
-                FROM boxers WHERE name = ?
-            """, (boxer_name,))
-
-            row = cursor.fetchone()
+    version = _boxer_cache_version
+    with _pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_GET_BY_ID, (boxer_id,))
 
-            if row:
-                boxer = Boxer(
-                    id=row[0], name=row[1], weight=row[2], height=row[3],
-                    reach=row[4], age=row[5]
-                )
-                return boxer
-            else:
-                raise ValueError(f"Boxer '{boxer_name}' not found.")
+        row = cursor.fetchone()
 
-    except sqlite3.Error as e:
-        raise e
+        if row:
+            boxer = _boxer_from_row(row)
+            _cache_boxer(boxer, version)
+            return boxer
+        else:
+            raise ValueError(_ERR_ID_NOT_FOUND.format(boxer_id))
 
 
+def get_boxer_by_name(boxer_name: str) -> Boxer:
+    boxer = _get_cached_boxer(_boxer_by_name, boxer_name)
+    if boxer is not None:
+        return boxer
+
+    version = _boxer_cache_version
+    with _pool.acquire() as conn:
+        cursor = conn.cursor()
+        cursor.execute(_SQL_GET_BY_NAME, (boxer_name,))
+
+        row = cursor.fetchone()
+
+        if row:
+            boxer = _boxer_from_row(row)
+            _cache_boxer(boxer, version)
+            return boxer
+        else:
+            raise ValueError(f"Boxer '{boxer_name}' not found.")
+
+
+def get_boxers_by_ids(boxer_ids: Iterable[int]) -> dict[int, Boxer]:
+    # Use this instead of calling get_boxer_by_id in a loop: cached boxers are
+    # returned directly and the rest are fetched with one IN (...) query per chunk.
+    # Ids that don't exist are simply absent from the result.
+    boxers = {}
+    missing = []
+    for boxer_id in dict.fromkeys(boxer_ids):
+        boxer = _get_cached_boxer(_boxer_by_id, boxer_id)
+        if boxer is not None:
+            boxers[boxer_id] = boxer
+        else:
+            missing.append(boxer_id)
+
+    if not missing:
+        return boxers
+
+    version = _boxer_cache_version
+    with _pool.acquire() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(missing), _MAX_IDS_PER_QUERY):
+            chunk = missing[start:start + _MAX_IDS_PER_QUERY]
+            cursor.execute(_SQL_GET_BY_IDS.format(",".join("?" * len(chunk))), chunk)
+
+            for row in cursor.fetchall():
+                boxer = _boxer_from_row(row)
+                _cache_boxer(boxer, version)
+                boxers[boxer.id] = boxer
+
+    return boxers
+
+
+@lru_cache(maxsize=1024)
 def get_weight_class(weight: int) -> str:
-    if weight >= 203:
-        weight_class = 'HEAVYWEIGHT'
-    elif weight >= 166:
-        weight_class = 'MIDDLEWEIGHT'
-    elif weight >= 133:
-        weight_class = 'LIGHTWEIGHT'
-    elif weight >= 125:
-        weight_class = 'FEATHERWEIGHT'
-    else:
-        raise ValueError(f"Invalid weight: {weight}. Weight must be at least 125.")
+    if weight < _WC_MIN_WEIGHT:
+        raise ValueError(_ERR_WEIGHT.format(weight))
 
-    return weight_class
+    return _WC_LABELS[bisect_right(_WC_CUTOFFS, weight)]
 
 
 def update_boxer_stats(boxer_id: int, result: str) -> None:
-    if result not in {'win', 'loss'}:
-        raise ValueError(f"Invalid result: {result}. Expected 'win' or 'loss'.")
-
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-
-            cursor.execute("SELECT id FROM boxers WHERE id = ?", (boxer_id,))
-            if cursor.fetchone() is None:
-                raise ValueError(f"Boxer with ID {boxer_id} not found.")
-
-            if result == 'win':
-                cursor.execute("UPDATE boxers SET fights = fights + 1, wins = wins + 1 WHERE id = ?", (boxer_id,))
-            else:  # result == 'loss'
-                cursor.execute("UPDATE boxers SET fights = fights + 1 WHERE id = ?", (boxer_id,))
-
-            conn.commit()
-
-    except sqlite3.Error as e:
-        raise e
+    update_boxer_stats_many([(boxer_id, result)])
+
+
+def update_boxer_stats_many(results: Iterable[tuple[int, str]]) -> None:
+    # Records several (boxer_id, result) pairs, e.g. both sides of a fight, with one
+    # executemany per result type inside a single transaction: all are written or none.
+    # Written straight away (cheap under WAL) so a recorded fight is never lost.
+    ids_by_result = {result: [] for result in _RESULT_SQL}
+    for boxer_id, result in results:
+        if result not in ids_by_result:
+            expected = " or ".join(f"'{valid}'" for valid in _RESULT_SQL)
+            raise ValueError(f"Invalid result: {result}. Expected {expected}.")
+        ids_by_result[result].append((boxer_id,))
+
+    expected_rows = sum(map(len, ids_by_result.values()))
+    if not expected_rows:
+        return
+
+    with _pool.transaction() as conn:
+        updated_rows = 0
+        for result, sql in _RESULT_SQL.items():
+            if ids_by_result[result]:
+                updated_rows += conn.executemany(sql, ids_by_result[result]).rowcount
+
+        if updated_rows < expected_rows:
+            # Rare path: find the id that matched no row (raising rolls the batch back)
+            for params in (params for ids in ids_by_result.values() for params in ids):
+                if conn.execute(_SQL_GET_BY_ID, params).fetchone() is None:
+                    raise ValueError(_ERR_ID_NOT_FOUND.format(params[0]))
+
+    _LEADERBOARD_CACHE.clear()
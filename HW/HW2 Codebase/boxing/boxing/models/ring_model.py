@@ -2,7 +2,7 @@ import logging
 import math
 from typing import List
 
-from boxing.models.boxers_model import Boxer, update_boxer_stats
+from boxing.models.boxers_model import Boxer, update_boxer_stats_many
 from boxing.utils.logger import configure_logger
 from boxing.utils.api_utils import get_random
 
@@ -38,8 +38,8 @@ class RingModel:
             winner = boxer_2
             loser = boxer_1
 
-        update_boxer_stats(winner.id, 'win')
-        update_boxer_stats(loser.id, 'loss')
+        # Both results are recorded in one transaction
+        update_boxer_stats_many([(winner.id, 'win'), (loser.id, 'loss')])
 
         self.clear_ring()
 
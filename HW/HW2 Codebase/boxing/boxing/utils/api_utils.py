@@ -1,6 +1,12 @@
+from collections import deque
 import logging
 import os
+import threading
+from typing import List
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from boxing.utils.logger import configure_logger
 
@@ -10,12 +16,29 @@ configure_logger(logger)
 
 
 RANDOM_ORG_URL = os.getenv("RANDOM_ORG_URL",
-                           "https://www.random.org/decimal-fractions/?num=1&dec=2&col=1&format=plain&rnd=new")
+                           "https://www.random.org/decimal-fractions/?num=96&dec=2&col=1&format=plain&rnd=new")
 
+# Reused across calls so the TCP/TLS connection to random.org is kept alive.
+# Only connection failures are retried; read timeouts surface as before.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                       max_retries=Retry(total=2, read=False, backoff_factor=0.1)))
+_session.headers["Connection"] = "keep-alive"
 
-def get_random() -> float:
+# Each request returns a batch of numbers (num=N in the URL); calls are served from here.
+# When fewer than _REFILL_THRESHOLD remain, a background thread fetches the next batch
+# so callers rarely wait on the network. Every fetch holds _refill_lock, so there is
+# never more than one in flight: batches can't overflow the buffer, and _session is
+# never used from two threads at once.
+_BUFFER_SIZE = 128
+_REFILL_THRESHOLD = 32
+_random_buffer = deque(maxlen=_BUFFER_SIZE)
+_refill_lock = threading.Lock()
+
+
+def _fetch_random_batch() -> List[float]:
     try:
-        response = requests.get(RANDOM_ORG_URL, timeout=5)
+        response = _session.get(RANDOM_ORG_URL, timeout=5)
 
         # Check if the request was successful
         response.raise_for_status()
@@ -23,14 +46,56 @@ def get_random() -> float:
         random_number_str = response.text.strip()
 
         try:
-            random_number = float(random_number_str)
+            random_numbers = [float(value) for value in random_number_str.split()]
         except ValueError:
             raise ValueError(f"Invalid response from random.org: {random_number_str}")
 
-        return random_number
+        if not random_numbers:
+            raise ValueError(f"Invalid response from random.org: {random_number_str}")
+
+        return random_numbers
 
     except requests.exceptions.Timeout:
         raise RuntimeError("Request to random.org timed out.")
 
     except requests.exceptions.RequestException as e:
         raise RuntimeError(f"Request to random.org failed: {e}")
+
+
+def _refill_random_buffer():
+    try:
+        _random_buffer.extend(_fetch_random_batch())
+    except (RuntimeError, ValueError) as e:
+        logger.warning(f"Background refill from random.org failed: {e}")
+    finally:
+        _refill_lock.release()
+
+
+def _maybe_start_refill():
+    # Only one refill runs at a time; the lock is released by the refill thread
+    if len(_random_buffer) < _REFILL_THRESHOLD and _refill_lock.acquire(blocking=False):
+        try:
+            threading.Thread(target=_refill_random_buffer, daemon=True).start()
+        except RuntimeError as e:
+            # No thread will release the lock, so do it here; the next empty-buffer
+            # call then fetches synchronously instead of blocking forever
+            _refill_lock.release()
+            logger.warning(f"Could not start background refill: {e}")
+
+
+def get_random() -> float:
+    try:
+        random_number = _random_buffer.popleft()
+    except IndexError:
+        # Buffer is empty (first call or refills falling behind). Wait for any refill
+        # in flight rather than racing it, and only fetch if it left nothing behind.
+        with _refill_lock:
+            try:
+                random_number = _random_buffer.popleft()
+            except IndexError:
+                random_numbers = _fetch_random_batch()
+                _random_buffer.extend(random_numbers[1:])
+                random_number = random_numbers[0]
+
+    _maybe_start_refill()
+    return random_number
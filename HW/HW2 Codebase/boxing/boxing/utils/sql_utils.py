@@ -1,7 +1,9 @@
 from contextlib import contextmanager
 import logging
 import os
+import queue
 import sqlite3
+import threading
 
 from boxing.utils.logger import configure_logger
 
@@ -12,6 +14,23 @@ configure_logger(logger)
 
 # load the db path from the environment with a default value
 DB_PATH = os.getenv("DB_PATH", "/app/sql/boxing.db")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+# Per-connection prepared statement cache (the sqlite3 default is 128)
+DB_CACHED_STATEMENTS = 256
+DB_BUSY_TIMEOUT_MS = 5000
+
+# Applied once to every pooled connection when it is opened
+# (busy_timeout first, so switching the journal mode waits for locks instead of failing)
+CONNECTION_PRAGMAS = (
+    f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS};",
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA wal_autocheckpoint=1000;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-64000;",
+    # Read pages through a shared memory mapping instead of read() syscalls
+    "PRAGMA mmap_size=268435456;",
+)
 
 
 def check_database_connection():
@@ -58,3 +77,123 @@ def get_db_connection():
     finally:
         if conn:
             conn.close()
+
+
+# A small pool of long-lived connections, opened lazily on first use.
+# One connection is reserved for writes (SQLite only allows a single writer anyway)
+# and the rest serve reads from a LIFO queue, so the most recently used connection
+# (with the warmest page cache) is handed out first. Readers and the writer are
+# opened independently, so reads never wait on the write lock.
+class ConnectionPool:
+
+    def __init__(self, db_path: str = None, size: int = None, read_statements=(), write_statements=()):
+        self.db_path = db_path
+        self.size = max(size or DB_POOL_SIZE, 2)
+        # (sql, params) pairs run once when a connection opens so later calls skip parsing:
+        # read_statements on the readers, write_statements on the writer
+        self.read_statements = tuple(read_statements)
+        self.write_statements = tuple(write_statements)
+        self._readers = queue.LifoQueue(maxsize=self.size - 1)
+        self._readers_open = False
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._init_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path or DB_PATH, check_same_thread=False, isolation_level=None,
+                               cached_statements=DB_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _warm(self, conn: sqlite3.Connection, statements):
+        for sql, params in statements:
+            try:
+                conn.execute(sql, params).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Could not prepare statement: {e}")
+
+    def _warm_writer(self, conn: sqlite3.Connection):
+        if not self.write_statements:
+            return
+        # Writes need the write lock; if another connection holds it, skip warming instead
+        # of waiting out busy_timeout (the statements are then prepared on first use).
+        # The transaction is always rolled back, so the writes leave no trace.
+        conn.execute("PRAGMA busy_timeout=0;")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Skipping write statement warmup: {e}")
+            return
+        finally:
+            conn.execute(f"PRAGMA busy_timeout={DB_BUSY_TIMEOUT_MS};")
+        try:
+            self._warm(conn, self.write_statements)
+        finally:
+            conn.rollback()
+
+    def _open_readers(self):
+        if self._readers_open:
+            return
+        with self._init_lock:
+            if self._readers_open:
+                return
+            logger.info(f"Opening {self.size - 1} pooled read connections to {self.db_path or DB_PATH}")
+            for _ in range(self.size - 1):
+                conn = self._connect()
+                self._warm(conn, self.read_statements)
+                self._readers.put_nowait(conn)
+            self._readers_open = True
+
+    def _open_writer(self):
+        if self._writer is not None:
+            return
+        with self._init_lock:
+            if self._writer is not None:
+                return
+            conn = self._connect()
+            self._warm_writer(conn)
+            self._writer = conn
+
+    @contextmanager
+    def acquire(self):
+        self._open_readers()
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    @contextmanager
+    def acquire_writer(self):
+        self._open_writer()
+        with self._writer_lock:
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+
+    @contextmanager
+    def transaction(self):
+        # Take the write lock up front so the transaction never has to upgrade
+        # from a read lock mid-way; commits on success, rolls back on error
+        with self.acquire_writer() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.commit()
+
+    def close(self):
+        with self._init_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._readers_open = False
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
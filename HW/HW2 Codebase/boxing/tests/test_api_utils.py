@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from boxing.utils import api_utils
+from boxing.utils.api_utils import get_random
+
+
+RANDOM_NUMBERS = [0.25, 0.5, 0.75]
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer(monkeypatch):
+    """Start every test with an empty buffer and no background refills.
+
+    """
+    api_utils._random_buffer.clear()
+    monkeypatch.setattr(api_utils, "_REFILL_THRESHOLD", 0)
+    yield
+    api_utils._random_buffer.clear()
+
+
+@pytest.fixture
+def mock_random_org(mocker):
+    # Patch the shared session's get; it returns a response listing RANDOM_NUMBERS
+    mock_response = mocker.Mock()
+    mock_response.text = "\n".join(str(number) for number in RANDOM_NUMBERS)
+    return mocker.patch.object(api_utils._session, "get", return_value=mock_response)
+
+
+def test_get_random_serves_batch_from_buffer(mock_random_org):
+    """Test that one request to random.org serves a whole batch of calls.
+
+    """
+    results = [get_random() for _ in RANDOM_NUMBERS]
+
+    assert results == RANDOM_NUMBERS
+    mock_random_org.assert_called_once_with(api_utils.RANDOM_ORG_URL, timeout=5)
+
+
+def test_get_random_waits_for_refill_in_flight(mock_random_org):
+    """Test that an empty buffer waits for a running refill instead of fetching again.
+
+    """
+    results = []
+    api_utils._refill_lock.acquire()  # A refill is in flight
+    caller = threading.Thread(target=lambda: results.append(get_random()))
+    caller.start()
+    time.sleep(0.1)
+    assert caller.is_alive(), "get_random should wait for the refill in flight"
+
+    # The refill lands and releases the lock, as _refill_random_buffer does
+    api_utils._random_buffer.extend([0.1, 0.2])
+    api_utils._refill_lock.release()
+    caller.join(timeout=1)
+
+    assert results == [0.1]
+    assert list(api_utils._random_buffer) == [0.2]
+    mock_random_org.assert_not_called()
+
+
+def test_get_random_invalid_response(mock_random_org):
+    """Test handling of a non-numeric response from random.org.
+
+    """
+    mock_random_org.return_value.text = "invalid"
+
+    with pytest.raises(ValueError, match="Invalid response from random.org: invalid"):
+        get_random()
+
+
+def test_get_random_request_failure(mocker):
+    """Test handling of a request failure when calling random.org.
+
+    """
+    mocker.patch.object(api_utils._session, "get", side_effect=requests.exceptions.RequestException("Connection error"))
+
+    with pytest.raises(RuntimeError, match="Request to random.org failed: Connection error"):
+        get_random()
+
+
+def test_get_random_timeout(mocker):
+    """Test handling of a timeout when calling random.org.
+
+    """
+    mocker.patch.object(api_utils._session, "get", side_effect=requests.exceptions.Timeout)
+
+    with pytest.raises(RuntimeError, match="Request to random.org timed out."):
+        get_random()
+
+
+def test_get_random_refill_thread_fails_to_start(mock_random_org, monkeypatch, mocker):
+    """Test that a refill thread that cannot start does not leave the refill lock held.
+
+    """
+    monkeypatch.setattr(api_utils, "_REFILL_THRESHOLD", 32)
+    mocker.patch("boxing.utils.api_utils.threading.Thread.start", side_effect=RuntimeError("can't start new thread"))
+
+    assert get_random() == RANDOM_NUMBERS[0]
+
+    assert not api_utils._refill_lock.locked()
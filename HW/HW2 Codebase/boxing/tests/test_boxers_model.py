@@ -0,0 +1,591 @@
+import dataclasses
+import os
+import sqlite3
+import time
+
+import pytest
+
+from boxing.models import boxers_model
+from boxing.models.boxers_model import (
+    create_boxer,
+    create_boxers,
+    delete_boxer,
+    get_boxer_by_id,
+    get_boxer_by_name,
+    get_boxers_by_ids,
+    get_leaderboard,
+    get_weight_class,
+    migrate_boxers_table,
+    update_boxer_stats,
+    update_boxer_stats_many
+)
+from boxing.utils import sql_utils
+
+
+INIT_DB_SQL = os.path.join(os.path.dirname(__file__), "..", "sql", "init_db.sql")
+
+# The boxers table as created by init_db.sql before win_ratio and the leaderboard indexes
+OLD_SCHEMA_SQL = """
+    DROP TABLE IF EXISTS boxers;
+    CREATE TABLE boxers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        weight REAL NOT NULL CHECK (weight > 0),
+        height REAL NOT NULL CHECK (height > 0),
+        reach REAL CHECK (reach > 0),
+        age INTEGER NOT NULL CHECK (age >= 18 AND age <= 40),
+        fights INTEGER DEFAULT 0 CHECK (fights >= 0),
+        wins INTEGER DEFAULT 0 CHECK (wins >= 0 AND wins <= fights)
+    );
+    CREATE UNIQUE INDEX idx_boxers_name ON boxers(name);
+"""
+
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the model's connection pool at a fresh database built by init_db.sql.
+
+    """
+    path = str(tmp_path / "boxing.db")
+    with sqlite3.connect(path) as conn:
+        with open(INIT_DB_SQL) as f:
+            conn.executescript(f.read())
+
+    monkeypatch.setattr(sql_utils, "DB_PATH", path)
+    boxers_model._pool.close()
+    boxers_model._boxer_by_id.clear()
+    boxers_model._boxer_by_name.clear()
+    boxers_model._LEADERBOARD_CACHE.clear()
+
+    yield path
+
+    boxers_model._pool.close()
+
+
+def read_names(db_path: str) -> list:
+    """Read all boxer names, in insertion order, through a separate connection.
+
+    """
+    with sqlite3.connect(db_path) as conn:
+        return [row[0] for row in conn.execute("SELECT name FROM boxers ORDER BY id")]
+
+
+def read_stats(db_path: str, boxer_id: int) -> tuple:
+    """Read a boxer's fights and wins through a separate connection.
+
+    """
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT fights, wins FROM boxers WHERE id = ?", (boxer_id,)).fetchone()
+
+
+@pytest.fixture
+def write_lock(db_path):
+    """Hold the database write lock from another connection for the duration of a test.
+
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    # The pool switches the file to WAL on first use; do it here since no pooled connection is open yet
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("BEGIN IMMEDIATE")
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+######################################################
+#
+#    Connection pool
+#
+######################################################
+
+
+def test_reads_do_not_wait_for_write_lock(db_path):
+    """Test that opening the read connections never waits on another process's writer.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    boxers_model._pool.close()
+    boxers_model._boxer_by_id.clear()
+
+    with sqlite3.connect(db_path, isolation_level=None) as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        start = time.monotonic()
+        boxer = get_boxer_by_id(1)
+        elapsed = time.monotonic() - start
+        conn.rollback()
+
+    assert boxer.name == "Ali"
+    assert elapsed < 1, f"Read took {elapsed:.1f}s while the write lock was held"
+
+
+def test_writer_warmup_skipped_while_locked(db_path, write_lock):
+    """Test that the writer skips its warmup rather than waiting for the write lock.
+
+    """
+    start = time.monotonic()
+    boxers_model._pool._open_writer()
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 1, f"Opening the writer took {elapsed:.1f}s while the write lock was held"
+
+
+def test_writer_warmup_leaves_no_rows(db_path):
+    """Test that the writes run to warm the writer connection are rolled back.
+
+    """
+    boxers_model._pool._open_writer()
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT id, name FROM boxers").fetchall() == [(1, "Ali")]
+
+
+######################################################
+#
+#    Migration
+#
+######################################################
+
+
+def test_migrate_boxers_table_upgrades_old_schema(db_path):
+    """Test that a database built by the old init_db.sql gains win_ratio and its indexes.
+
+    """
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript(OLD_SCHEMA_SQL)
+        conn.executemany(
+            "INSERT INTO boxers (name, weight, height, reach, age, fights, wins) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [("Ali", 210, 75, 78.0, 30, 4, 1), ("Joe", 140, 70, 70.0, 25, 2, 2)]
+        )
+
+    migrate_boxers_table()
+    migrate_boxers_table()  # Running it again is a no-op
+
+    assert [row["name"] for row in get_leaderboard("win_pct")] == ["Joe", "Ali"]
+    with sqlite3.connect(db_path) as conn:
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(boxers)")}
+    assert {"idx_boxers_lb_wins", "idx_boxers_lb_win_ratio"} <= indexes
+
+
+def test_migrate_boxers_table_current_schema(db_path):
+    """Test that migrating a database built by the current init_db.sql changes nothing.
+
+    """
+    migrate_boxers_table()
+
+    assert get_leaderboard("win_pct") == []
+
+
+######################################################
+#
+#    Bulk create
+#
+######################################################
+
+
+def test_create_boxers(db_path):
+    """Test that every row of a batch is inserted and the leaderboard cache is cleared.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    update_boxer_stats(1, "win")
+    get_leaderboard()
+    assert boxers_model._LEADERBOARD_CACHE
+
+    create_boxers([
+        ("Frazier", 215, 71, 73.0, 28),
+        ("Foreman", 220, 76, 79.0, 26),
+    ])
+
+    assert read_names(db_path) == ["Ali", "Frazier", "Foreman"]
+    assert not boxers_model._LEADERBOARD_CACHE
+    assert get_boxer_by_name("Foreman").weight_class == "HEAVYWEIGHT"
+
+
+def test_create_boxers_duplicate_in_batch(db_path):
+    """Test that a name repeated within the batch is reported and nothing is inserted.
+
+    """
+    with pytest.raises(ValueError, match="Boxer with name 'Ali' already exists"):
+        create_boxers([
+            ("Ali", 210, 75, 78.0, 30),
+            ("Frazier", 215, 71, 73.0, 28),
+            ("Ali", 205, 75, 78.0, 31),
+        ])
+
+    assert read_names(db_path) == []
+
+
+def test_create_boxers_existing_name(db_path):
+    """Test that a clash with an existing boxer is reported and the batch is rolled back.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    with pytest.raises(ValueError, match="Boxer with name 'Ali' already exists"):
+        create_boxers([
+            ("Frazier", 215, 71, 73.0, 28),
+            ("Ali", 205, 75, 78.0, 31),
+        ])
+
+    assert read_names(db_path) == ["Ali"]
+
+
+def test_create_boxers_invalid_row_inserts_nothing(db_path):
+    """Test that one row failing validation rejects the whole batch before any insert.
+
+    """
+    with pytest.raises(ValueError, match="Invalid age: 17. Must be between 18 and 40."):
+        create_boxers([
+            ("Frazier", 215, 71, 73.0, 28),
+            ("Foreman", 220, 76, 79.0, 17),
+        ])
+
+    assert read_names(db_path) == []
+
+
+def test_create_boxers_integrity_error_rolls_back(db_path):
+    """Test that a constraint failure not caused by a name clash is re-raised and rolls back the batch.
+
+    """
+    with pytest.raises(sqlite3.IntegrityError):
+        create_boxers([
+            ("Frazier", 215, 71, 73.0, 28),
+            (None, 220, 76, 79.0, 26),
+        ])
+
+    assert read_names(db_path) == []
+
+
+######################################################
+#
+#    Weight class
+#
+######################################################
+
+
+@pytest.mark.parametrize("weight", [125, 132.5, 133, 165.9, 166, 202, 203, 300])
+def test_sql_weight_class_matches_get_weight_class(weight):
+    """Test that SQLite's weight class agrees with get_weight_class, including at the cutoffs.
+
+    """
+    with sqlite3.connect(":memory:") as conn:
+        sql_class, = conn.execute(f"SELECT {boxers_model._SQL_WEIGHT_CLASS} FROM (SELECT ? AS weight)", (weight,)).fetchone()
+
+    assert sql_class == get_weight_class(weight)
+
+
+def test_lookup_of_stored_weight_below_minimum_raises(db_path):
+    """Test that a stored weight below 125 is rejected on lookup, as get_weight_class does.
+
+    """
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO boxers (name, weight, height, reach, age) VALUES ('Tiny', 100, 60, 60.0, 20)")
+
+    with pytest.raises(ValueError, match="Invalid weight: 100.0. Must be at least 125."):
+        get_boxer_by_id(1)
+
+
+######################################################
+#
+#    Leaderboard
+#
+######################################################
+
+
+def test_get_leaderboard_rows_do_not_alias_cache(db_path):
+    """Test that editing a returned leaderboard row does not change the cached leaderboard.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    update_boxer_stats(1, "win")
+
+    leaderboard = get_leaderboard()
+    leaderboard[0]["name"] = "MUTATED"
+    leaderboard.append({"name": "EXTRA"})
+
+    assert [row["name"] for row in get_leaderboard()] == ["Ali"]
+
+
+######################################################
+#
+#    Lookup cache
+#
+######################################################
+
+
+def test_cached_boxer_cannot_be_mutated(db_path):
+    """Test that a Boxer handed out from the lookup cache is read-only.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    boxer = get_boxer_by_id(1)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        boxer.name = "MUTATED"
+
+    assert get_boxer_by_id(1).name == "Ali"
+
+
+def test_delete_boxer_invalidates_cached_lookups(db_path):
+    """Test that a deleted boxer is dropped from both lookup caches.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    assert get_boxer_by_name("Ali") is get_boxer_by_id(1)
+
+    delete_boxer(1)
+
+    assert 1 not in boxers_model._boxer_by_id
+    assert "Ali" not in boxers_model._boxer_by_name
+    with pytest.raises(ValueError, match="Boxer with ID 1 not found."):
+        get_boxer_by_id(1)
+    with pytest.raises(ValueError, match="Boxer 'Ali' not found."):
+        get_boxer_by_name("Ali")
+
+
+def test_delete_boxer_invalidates_name_after_id_evicted(db_path):
+    """Test that the name entry is dropped even when the id entry was already evicted.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    get_boxer_by_name("Ali")
+    boxers_model._boxer_by_id.clear()
+
+    delete_boxer(1)
+
+    assert "Ali" not in boxers_model._boxer_by_name
+
+
+@pytest.fixture
+def id_query_sizes(monkeypatch):
+    """Records how many ids each get_boxers_by_ids query asks the database for.
+
+    """
+    sizes = []
+
+    class RecordingSQL(str):
+        def format(self, placeholders):
+            sizes.append(placeholders.count("?"))
+            return str.format(self, placeholders)
+
+    monkeypatch.setattr(boxers_model, "_SQL_GET_BY_IDS", RecordingSQL(boxers_model._SQL_GET_BY_IDS))
+    return sizes
+
+
+def test_get_boxers_by_ids_only_queries_uncached(db_path, id_query_sizes):
+    """Test that cached boxers are served from the cache and only misses are queried.
+
+    """
+    for name in ("Ali", "Frazier", "Foreman"):
+        create_boxer(name, 210, 75, 78.0, 30)
+    cached = get_boxer_by_id(1)
+
+    # Remove the row behind the cached boxer; it can only be returned from the cache
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM boxers WHERE id = 1")
+
+    boxers = get_boxers_by_ids([1, 2, 3])
+
+    assert boxers[1] is cached
+    assert [boxers[2].name, boxers[3].name] == ["Frazier", "Foreman"]
+    assert id_query_sizes == [2]
+    assert get_boxer_by_id(2) is boxers[2]
+
+
+def test_get_boxers_by_ids_all_cached(db_path, id_query_sizes):
+    """Test that no query is made when every id is cached.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    get_boxer_by_id(1)
+
+    assert list(get_boxers_by_ids([1])) == [1]
+    assert id_query_sizes == []
+
+
+def test_get_boxers_by_ids_duplicate_ids(db_path, id_query_sizes):
+    """Test that duplicate ids are looked up once and returned once.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    create_boxer("Frazier", 215, 71, 73.0, 28)
+
+    boxers = get_boxers_by_ids([2, 1, 2, 1])
+
+    assert sorted(boxers) == [1, 2]
+    assert id_query_sizes == [2]
+
+
+def test_get_boxers_by_ids_missing_ids_omitted(db_path):
+    """Test that ids with no boxer are left out of the result instead of raising.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    boxers = get_boxers_by_ids([1, 99])
+
+    assert list(boxers) == [1]
+    assert boxers[1].name == "Ali"
+
+
+def test_get_boxers_by_ids_empty(db_path, id_query_sizes):
+    """Test that an empty iterable returns an empty dict without querying.
+
+    """
+    assert get_boxers_by_ids(iter([])) == {}
+    assert id_query_sizes == []
+
+
+def test_get_boxers_by_ids_chunks_large_requests(db_path, id_query_sizes, monkeypatch):
+    """Test that more than _MAX_IDS_PER_QUERY misses are split across queries.
+
+    """
+    monkeypatch.setattr(boxers_model, "_MAX_IDS_PER_QUERY", 2)
+    for i in range(5):
+        create_boxer(f"Boxer {i}", 210, 75, 78.0, 30)
+
+    boxers = get_boxers_by_ids(range(1, 6))
+
+    assert sorted(boxers) == [1, 2, 3, 4, 5]
+    assert id_query_sizes == [2, 2, 1]
+
+
+######################################################
+#
+#    Fight results
+#
+######################################################
+
+
+def test_update_boxer_stats_win_is_written_immediately(db_path):
+    """Test that a win is in the database as soon as update_boxer_stats returns.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    update_boxer_stats(1, "win")
+
+    assert read_stats(db_path, 1) == (1, 1)
+
+
+def test_update_boxer_stats_loss_is_written_immediately(db_path):
+    """Test that a loss is in the database as soon as update_boxer_stats returns.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    update_boxer_stats(1, "loss")
+
+    assert read_stats(db_path, 1) == (1, 0)
+
+
+def test_update_boxer_stats_visible_in_leaderboard(db_path):
+    """Test that a cached leaderboard reflects a fight recorded after it was built.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    assert get_leaderboard() == []
+
+    update_boxer_stats(1, "win")
+
+    leaderboard = get_leaderboard()
+    assert [(row["id"], row["fights"], row["wins"]) for row in leaderboard] == [(1, 1, 1)]
+
+
+def test_update_boxer_stats_boxer_not_found(db_path):
+    """Test updating the stats of a boxer that does not exist.
+
+    """
+    with pytest.raises(ValueError, match="Boxer with ID 99 not found."):
+        update_boxer_stats(99, "win")
+
+
+def test_update_boxer_stats_invalid_result(db_path):
+    """Test updating stats with an invalid result.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    with pytest.raises(ValueError, match="Invalid result: draw. Expected 'win' or 'loss'."):
+        update_boxer_stats(1, "draw")
+
+    assert read_stats(db_path, 1) == (0, 0)
+
+
+def test_update_boxer_stats_new_result_type(db_path, monkeypatch):
+    """Test that a result added to _RESULT_SQL is accepted and listed in the error message.
+
+    """
+    monkeypatch.setitem(boxers_model._RESULT_SQL, "draw", "UPDATE boxers SET fights = fights + 1 WHERE id = ?")
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    update_boxer_stats(1, "draw")
+    assert read_stats(db_path, 1) == (1, 0)
+
+    with pytest.raises(ValueError, match="Invalid result: ko. Expected 'win' or 'loss' or 'draw'."):
+        update_boxer_stats(1, "ko")
+
+
+def test_update_boxer_stats_many_records_all_results(db_path):
+    """Test recording several results, including repeats for one boxer, in one call.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    create_boxer("Joe", 140, 70, 70.0, 25)
+
+    update_boxer_stats_many([(1, "win"), (2, "loss"), (1, "win"), (2, "win")])
+
+    assert read_stats(db_path, 1) == (2, 2)
+    assert read_stats(db_path, 2) == (2, 1)
+
+
+def test_update_boxer_stats_many_visible_in_leaderboard(db_path):
+    """Test that a cached leaderboard reflects a batch of results recorded after it was built.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+    create_boxer("Joe", 140, 70, 70.0, 25)
+    assert get_leaderboard() == []
+
+    update_boxer_stats_many([(1, "win"), (2, "loss")])
+
+    assert [(row["id"], row["wins"]) for row in get_leaderboard()] == [(1, 1), (2, 0)]
+
+
+def test_update_boxer_stats_many_missing_boxer_rolls_back(db_path):
+    """Test that a batch with an unknown boxer raises and writes none of its results.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    with pytest.raises(ValueError, match="Boxer with ID 99 not found."):
+        update_boxer_stats_many([(1, "win"), (99, "loss")])
+
+    assert read_stats(db_path, 1) == (0, 0)
+
+
+def test_update_boxer_stats_many_invalid_result_writes_nothing(db_path):
+    """Test that a batch with an invalid result raises before anything is written.
+
+    """
+    create_boxer("Ali", 210, 75, 78.0, 30)
+
+    with pytest.raises(ValueError, match="Invalid result: draw."):
+        update_boxer_stats_many([(1, "win"), (1, "draw")])
+
+    assert read_stats(db_path, 1) == (0, 0)
+
+
+def test_update_boxer_stats_many_empty(db_path):
+    """Test that an empty batch is a no-op.
+
+    """
+    update_boxer_stats_many([])
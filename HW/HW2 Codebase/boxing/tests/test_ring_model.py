@@ -0,0 +1,46 @@
+import pytest
+
+from boxing.models.boxers_model import Boxer
+from boxing.models.ring_model import RingModel
+
+
+@pytest.fixture
+def ring_model():
+    """Fixture to provide a new instance of RingModel for each test.
+
+    """
+    return RingModel()
+
+
+@pytest.fixture
+def sample_boxers():
+    return [
+        Boxer(id=1, name="Ali", weight=210, height=75, reach=78.0, age=30),
+        Boxer(id=2, name="Joe", weight=140, height=70, reach=70.0, age=25),
+    ]
+
+
+def test_fight_records_both_results_in_one_batch(ring_model, sample_boxers, mocker):
+    """Test that a fight records the winner and loser with a single batched update.
+
+    """
+    mocker.patch("boxing.models.ring_model.get_random", return_value=0.0)
+    mock_update = mocker.patch("boxing.models.ring_model.update_boxer_stats_many")
+    for boxer in sample_boxers:
+        ring_model.enter_ring(boxer)
+
+    winner = ring_model.fight()
+
+    assert winner == "Ali"
+    mock_update.assert_called_once_with([(1, "win"), (2, "loss")])
+    assert ring_model.get_boxers() == []
+
+
+def test_fight_requires_two_boxers(ring_model, sample_boxers):
+    """Test that a fight with fewer than two boxers raises an error.
+
+    """
+    ring_model.enter_ring(sample_boxers[0])
+
+    with pytest.raises(ValueError, match="There must be two boxers to start a fight."):
+        ring_model.fight()